@@ -0,0 +1,119 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from fastapi import HTTPException
+
+
+class RequestDropped(Exception):
+    """Raised mid-request once the deadline passed or the client went away"""
+
+
+class Deadline:
+    """Point in time after which a request's result is no longer wanted"""
+
+    def __init__(self, seconds):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        return self.expires_at - time.monotonic()
+
+    def expired(self):
+        return self.remaining() <= 0
+
+
+def request_deadline(http_request, default_seconds):
+    """Deadline from the X-Request-Timeout header, capped at the server default"""
+    seconds = default_seconds
+    header = http_request.headers.get("x-request-timeout")
+    if header:
+        try:
+            seconds = min(seconds, float(header))
+        except ValueError:
+            pass
+    return Deadline(seconds)
+
+
+class AdmissionController:
+    """Concurrency limit with a bounded wait queue for one endpoint.
+
+    Requests beyond max_concurrency wait in a queue of at most max_queue
+    entries for up to queue_timeout seconds (or their deadline, if sooner).
+    Anything that cannot be admitted is rejected with 503 and Retry-After
+    instead of piling up, and requests whose client disconnected or whose
+    deadline passed while queued are dropped before any work is done.
+    """
+
+    def __init__(self, name, max_concurrency, max_queue, queue_timeout, retry_after=1):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.queued = 0
+        self.shed = 0
+        self.dropped = 0
+
+    def _overloaded(self):
+        self.shed += 1
+        return HTTPException(
+            status_code=503,
+            detail=f"Server overloaded ({self.name}), retry later",
+            headers={"Retry-After": str(self.retry_after)}
+        )
+
+    def _dropped(self):
+        self.dropped += 1
+        return HTTPException(status_code=503, detail="Request deadline exceeded",
+                             headers={"Retry-After": str(self.retry_after)})
+
+    async def _acquire(self, deadline):
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+            return
+        if self.waiting >= self.max_queue:
+            raise self._overloaded()
+
+        self.waiting += 1
+        self.queued += 1
+        try:
+            timeout = min(self.queue_timeout, deadline.remaining())
+            await asyncio.wait_for(self._semaphore.acquire(), max(timeout, 0))
+        except asyncio.TimeoutError:
+            raise self._overloaded()
+        finally:
+            self.waiting -= 1
+
+    @asynccontextmanager
+    async def admit(self, http_request, deadline):
+        await self._acquire(deadline)
+        try:
+            if deadline.expired() or await http_request.is_disconnected():
+                raise self._dropped()
+            self.active += 1
+            self.admitted += 1
+            try:
+                yield
+            except RequestDropped:
+                # Work abandoned part-way through is reported like expiry in the queue
+                raise self._dropped()
+            finally:
+                self.active -= 1
+        finally:
+            self._semaphore.release()
+
+    def stats(self):
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "shed": self.shed,
+            "dropped": self.dropped
+        }
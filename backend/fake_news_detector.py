@@ -1,3 +1,4 @@
+import hashlib
 import pickle
 import joblib
 import re
@@ -5,31 +6,43 @@ import numpy as np
 from nltk.corpus import stopwords
 from nltk.stem import PorterStemmer
 import nltk
+from quantized_model import QUANTIZED_FORMAT, load_quantized
 
 class FakeNewsDetector:
-    def __init__(self, model_path):
+    def __init__(self, model_path, cache=None, near_duplicates=None, telemetry=None):
         """Initialize the model from saved artifacts"""
+        # Optional PredictionCache shared across workers
+        self.cache = cache
+        # Optional NearDuplicateIndex reusing verdicts for syndicated copies
+        self.near_duplicates = near_duplicates
+        # Optional DriftTelemetry tracking vocabulary coverage
+        self.telemetry = telemetry
         try:
             # Try joblib first, then pickle
             if model_path.endswith('.joblib'):
-                self.artifacts = joblib.load(model_path)
+                artifacts = joblib.load(model_path)
             else:
                 with open(model_path, 'rb') as f:
-                    self.artifacts = pickle.load(f)
+                    artifacts = pickle.load(f)
             
-            self.model = self.artifacts['model']
-
-            # Check if vectorizer is separate or part of the model pipeline
-            if 'vectorizer' in self.artifacts:
-                self.vectorizer = self.artifacts['vectorizer']
-            elif hasattr(self.model, 'named_steps'):
-                # Model is a pipeline, vectorizer is inside
-                self.vectorizer = None  # Will use the pipeline directly
+            if artifacts.get('format') == QUANTIZED_FORMAT:
+                # Reduced-precision export from export_quantized.py
+                self.vectorizer, self.model = load_quantized(artifacts)
             else:
-                # Try to extract vectorizer from model
-                self.vectorizer = getattr(self.model, 'vectorizer_', None)
+                self.model = artifacts['model']
 
-            self.metadata = self.artifacts.get('metadata', {})
+                # Check if vectorizer is separate or part of the model pipeline
+                if 'vectorizer' in artifacts:
+                    self.vectorizer = artifacts['vectorizer']
+                elif hasattr(self.model, 'named_steps'):
+                    # Model is a pipeline, vectorizer is inside
+                    self.vectorizer = None  # Will use the pipeline directly
+                else:
+                    # Try to extract vectorizer from model
+                    self.vectorizer = getattr(self.model, 'vectorizer_', None)
+
+            self.metadata = artifacts.get('metadata', {})
+            self.model_version = self._model_version(model_path)
             self.ps = PorterStemmer()
 
             # Download stopwords if not available
@@ -45,6 +58,13 @@ class FakeNewsDetector:
             print(f"Error loading model: {e}")
             # Create a simple fallback model
             self._create_fallback_model()
+
+    def _model_version(self, model_path):
+        """Version string used to key cached predictions"""
+        with open(model_path, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()[:12]
+        version = self.metadata.get('version')
+        return f"{version}-{digest}" if version else digest
     
     def _create_fallback_model(self):
         """Create a simple fallback model if main model fails"""
@@ -64,6 +84,7 @@ class FakeNewsDetector:
         self.model = LogisticRegression()
         self.model.fit(X, labels)
         self.metadata = {'model_type': 'Fallback Model', 'accuracy': 0.75}
+        self.model_version = 'fallback'
         self.stop_words = set(stopwords.words('english'))
         self.ps = PorterStemmer()
     
@@ -78,29 +99,104 @@ class FakeNewsDetector:
         
         return ' '.join(words)
     
+    def _format_result(self, prediction, fake_probability):
+        return {
+            'prediction': int(prediction),
+            'confidence': float(max(fake_probability, 1.0 - fake_probability)),
+            'class': 'FAKE' if prediction == 1 else 'REAL',
+            'probabilities': {
+                'real': float(1.0 - fake_probability),
+                'fake': float(fake_probability)
+            }
+        }
+
+    def _predict_processed(self, processed_texts):
+        """Run the model on already-preprocessed texts"""
+        # If vectorizer is None, model is a pipeline
+        if self.vectorizer is None:
+            features = processed_texts
+        else:
+            features = self.vectorizer.transform(processed_texts)
+        probabilities = self.model.predict_proba(features)
+        predictions = self.model.classes_[np.argmax(probabilities, axis=1)]
+        return predictions, probabilities[:, 1]
+
+    def _score(self, processed_texts):
+        """Resolve texts from the cache, then the near-duplicate index, then the model.
+
+        The optional layers only ever save work: if one of them fails, the
+        error is logged and the texts fall through to the model.
+        """
+        results = [None] * len(processed_texts)
+        pending = list(range(len(processed_texts)))
+
+        if self.cache is not None:
+            try:
+                hits = self.cache.get_many(self.model_version, processed_texts)
+            except Exception as e:
+                print(f"Prediction cache read error: {e}")
+                hits = [None] * len(processed_texts)
+            for i, hit in enumerate(hits):
+                if hit is not None:
+                    results[i] = self._format_result(*hit)
+            pending = [i for i in pending if results[i] is None]
+
+        if self.near_duplicates is not None and pending:
+            try:
+                matches = self.near_duplicates.query_many([processed_texts[i] for i in pending])
+            except Exception as e:
+                print(f"Near-duplicate lookup error: {e}")
+                matches = [None] * len(pending)
+            for i, match in zip(pending, matches):
+                if match is not None:
+                    entry_id, similarity, prediction, fake_probability = match
+                    results[i] = self._format_result(prediction, fake_probability)
+                    results[i]['near_duplicate'] = {'id': entry_id, 'similarity': similarity}
+            pending = [i for i in pending if results[i] is None]
+
+        if pending:
+            predictions, fake_probabilities = self._predict_processed(
+                [processed_texts[i] for i in pending])
+            scored = [(processed_texts[i], prediction, fake_probability)
+                      for i, prediction, fake_probability
+                      in zip(pending, predictions, fake_probabilities)]
+            for i, (_, prediction, fake_probability) in zip(pending, scored):
+                results[i] = self._format_result(prediction, fake_probability)
+
+            if self.cache is not None:
+                try:
+                    self.cache.put_many(self.model_version, scored)
+                except Exception as e:
+                    print(f"Prediction cache write error: {e}")
+            if self.near_duplicates is not None:
+                try:
+                    self.near_duplicates.add_many(scored)
+                except Exception as e:
+                    print(f"Near-duplicate index error: {e}")
+
+        if self.telemetry is not None:
+            try:
+                vocabulary = self._vocabulary()
+                for processed_text, result in zip(processed_texts, results):
+                    self.telemetry.observe(processed_text, result['probabilities']['fake'], vocabulary)
+            except Exception as e:
+                print(f"Telemetry error: {e}")
+
+        return results
+
+    def _vocabulary(self):
+        """Fitted vocabulary of the vectorizer, or None if unavailable"""
+        vectorizer = self.vectorizer
+        if vectorizer is None and hasattr(self.model, 'steps'):
+            vectorizer = self.model.steps[0][1]
+        return getattr(vectorizer, 'vocabulary_', None)
+
     def predict(self, news_text):
         """Make prediction on news text"""
         processed_text = self.preprocess_text(news_text)
 
         try:
-            # If vectorizer is None, model is a pipeline
-            if self.vectorizer is None:
-                prediction = self.model.predict([processed_text])[0]
-                probability = self.model.predict_proba([processed_text])[0]
-            else:
-                text_vector = self.vectorizer.transform([processed_text])
-                prediction = self.model.predict(text_vector)[0]
-                probability = self.model.predict_proba(text_vector)[0]
-
-            return {
-                'prediction': int(prediction),
-                'confidence': float(np.max(probability)),
-                'class': 'FAKE' if prediction == 1 else 'REAL',
-                'probabilities': {
-                    'real': float(probability[0]),
-                    'fake': float(probability[1])
-                }
-            }
+            return self._score([processed_text])[0]
         except Exception as e:
             print(f"Prediction error: {e}")
             return {
@@ -109,6 +205,10 @@ class FakeNewsDetector:
                 'class': 'REAL',
                 'probabilities': {'real': 0.5, 'fake': 0.5}
             }
-    
+
+    def predict_batch(self, news_texts):
+        """Make predictions for several texts with a single model call"""
+        return self._score([self.preprocess_text(text) for text in news_texts])
+
     def get_model_info(self):
         return self.metadata
\ No newline at end of file
@@ -0,0 +1,149 @@
+import hashlib
+import threading
+import time
+import zlib
+from collections import OrderedDict
+import numpy as np
+
+# Mersenne prime for the universal hash family; 32-bit inputs keep a * x + b below 2**64
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def shingles(processed_text, size=2):
+    """Token shingles of preprocessed text (falls back to single tokens)"""
+    tokens = processed_text.split()
+    if len(tokens) < size:
+        return set(tokens)
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def lsh_params(threshold, num_perm):
+    """Pick (bands, rows) whose S-curve knee sits just below the threshold.
+
+    Candidates are verified against the estimated Jaccard afterwards, so it
+    is better to over-collect slightly than to miss true matches.
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        knee = (1.0 / bands) ** (1.0 / rows)
+        if knee <= threshold and (best is None or knee > best[0]):
+            best = (knee, bands, rows)
+    if best is None:
+        return num_perm, 1
+    return best[1], best[2]
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index of recently scored texts.
+
+    Maps near-duplicate texts (estimated Jaccard similarity of token shingles
+    at or above threshold) to the verdict of the first copy that was scored.
+    Entries expire after ttl seconds and the oldest are dropped once
+    max_entries is reached, so memory stays bounded.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=64, ttl=86400, max_entries=100_000,
+                 shingle_size=2, seed=1):
+        if not 0 < threshold <= 1:
+            raise ValueError(f"Near-duplicate threshold must be in (0, 1], got {threshold}")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.shingle_size = shingle_size
+        self.bands, self.rows = lsh_params(threshold, num_perm)
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+        # id -> (signature, band keys, prediction, fake_probability, timestamp)
+        self._entries = OrderedDict()
+        self._buckets = [{} for _ in range(self.bands)]
+        self._lock = threading.Lock()
+
+    def signature(self, processed_text):
+        """MinHash signature, or None for texts with no tokens"""
+        grams = shingles(processed_text, self.shingle_size)
+        if not grams:
+            return None
+        hashes = np.fromiter((zlib.crc32(gram.encode('utf-8')) for gram in grams),
+                             dtype=np.uint64, count=len(grams))
+        permuted = (np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes()
+                for i in range(self.bands)]
+
+    def _expire(self, now):
+        while self._entries:
+            entry_id, entry = next(iter(self._entries.items()))
+            if len(self._entries) < self.max_entries and now - entry[4] < self.ttl:
+                break
+            self._remove(entry_id)
+
+    def _remove(self, entry_id):
+        entry = self._entries.pop(entry_id)
+        for band, key in enumerate(entry[1]):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[band][key]
+
+    def _query_signature(self, signature, now):
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(key, ()))
+
+        best = None
+        for entry_id in candidates:
+            entry = self._entries[entry_id]
+            if now - entry[4] >= self.ttl:
+                continue
+            similarity = float(np.mean(entry[0] == signature))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (entry_id, similarity, entry[2], entry[3])
+        return best
+
+    def query(self, processed_text):
+        """Return (id, similarity, prediction, fake_probability) or None"""
+        return self.query_many([processed_text])[0]
+
+    def query_many(self, processed_texts):
+        """Batch lookup; returns a list aligned with the input"""
+        signatures = [self.signature(text) for text in processed_texts]
+        now = time.monotonic()
+        with self._lock:
+            return [None if signature is None else self._query_signature(signature, now)
+                    for signature in signatures]
+
+    def add(self, processed_text, prediction, fake_probability):
+        self.add_many([(processed_text, prediction, fake_probability)])
+
+    def add_many(self, entries):
+        """Index (processed_text, prediction, fake_probability) tuples"""
+        signed = [(text, self.signature(text), prediction, fake_probability)
+                  for text, prediction, fake_probability in entries]
+        now = time.monotonic()
+        with self._lock:
+            for text, signature, prediction, fake_probability in signed:
+                if signature is None:
+                    continue
+                entry_id = hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+                if entry_id in self._entries:
+                    self._remove(entry_id)
+                self._expire(now)
+                keys = self._band_keys(signature)
+                self._entries[entry_id] = (signature, keys, int(prediction),
+                                           float(fake_probability), now)
+                for band, key in enumerate(keys):
+                    self._buckets[band].setdefault(key, set()).add(entry_id)
+
+    def __len__(self):
+        return len(self._entries)
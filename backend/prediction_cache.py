@@ -0,0 +1,102 @@
+import hashlib
+import os
+import sqlite3
+import threading
+
+# Check the table size every N writes rather than on every insert
+EVICTION_CHECK_INTERVAL = 256
+
+
+def text_hash(processed_text):
+    """Stable digest of preprocessed text used as the cache key"""
+    return hashlib.sha1(processed_text.encode('utf-8')).digest()
+
+
+class PredictionCache:
+    """Persistent prediction cache shared by all workers on a host.
+
+    Backed by SQLite in WAL mode so concurrent readers never block on the
+    writer. Entries are keyed by (model version, hash of preprocessed text)
+    and evicted oldest-write-first once the table exceeds max_entries.
+    """
+
+    def __init__(self, path, max_entries=1_000_000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False,
+                                    isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS predictions (
+                model_version TEXT NOT NULL,
+                text_hash BLOB NOT NULL,
+                prediction INTEGER NOT NULL,
+                fake_probability REAL NOT NULL,
+                PRIMARY KEY (model_version, text_hash)
+            )
+        """)
+
+    def get(self, model_version, processed_text):
+        """Return (prediction, fake_probability) or None on a miss"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT prediction, fake_probability FROM predictions "
+                "WHERE model_version = ? AND text_hash = ?",
+                (model_version, text_hash(processed_text))
+            ).fetchone()
+        return row
+
+    def get_many(self, model_version, processed_texts):
+        """Look up several texts; returns a list aligned with the input"""
+        return [self.get(model_version, text) for text in processed_texts]
+
+    def put(self, model_version, processed_text, prediction, fake_probability):
+        self.put_many(model_version, [(processed_text, prediction, fake_probability)])
+
+    def put_many(self, model_version, entries):
+        """Store (processed_text, prediction, fake_probability) tuples"""
+        rows = [(model_version, text_hash(text), int(prediction), float(fake_probability))
+                for text, prediction, fake_probability in entries]
+        if not rows:
+            return
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                # REPLACE assigns a fresh rowid, moving rewrites to the back of the eviction order
+                self.conn.executemany("INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?)", rows)
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+            self._writes += len(rows)
+            if self._writes >= EVICTION_CHECK_INTERVAL:
+                self._writes = 0
+                self._evict()
+
+    def _evict(self):
+        """Drop the oldest writes once the table grows past max_entries"""
+        low, high = self.conn.execute(
+            "SELECT MIN(rowid), MAX(rowid) FROM predictions"
+        ).fetchone()
+        # rowids grow monotonically, so the span bounds the row count cheaply
+        if low is None or high - low + 1 <= self.max_entries:
+            return
+        self.conn.execute("DELETE FROM predictions WHERE rowid <= ?",
+                          (high - self.max_entries,))
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,106 @@
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+
+QUANTIZED_FORMAT = 'quantized-linear'
+
+# CountVectorizer params that only matter when fitting the vocabulary
+FIT_ONLY_PARAMS = ('vocabulary', 'max_features', 'max_df', 'min_df')
+
+
+class QuantizedLinearModel:
+    """Binary linear classifier scoring with float32 or int8 weights.
+
+    int8 weights carry a single per-tensor scale; the sparse count vector is
+    multiplied by the integer weights and rescaled once, so scoring needs no
+    dequantized copy of the weights.
+    """
+
+    def __init__(self, weights, scale, intercept, classes):
+        self.weights = weights
+        self.scale = float(scale)
+        self.intercept = float(intercept)
+        self.classes_ = np.asarray(classes)
+
+    def decision_function(self, X):
+        return np.asarray(X @ self.weights, dtype=np.float64).ravel() * self.scale + self.intercept
+
+    def predict_proba(self, X):
+        fake_probability = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1.0 - fake_probability, fake_probability])
+
+    def predict(self, X):
+        return self.classes_[(self.decision_function(X) > 0).astype(int)]
+
+
+def split_artifacts(artifacts):
+    """Return (vectorizer, classifier) from either artifact layout"""
+    model = artifacts['model']
+    if 'vectorizer' in artifacts:
+        return artifacts['vectorizer'], model
+    if hasattr(model, 'named_steps'):
+        return model.steps[0][1], model.steps[-1][1]
+    raise ValueError("Artifacts have no vectorizer to quantize")
+
+
+def quantize_artifacts(artifacts, dtype='float32', prune=0.001):
+    """Build quantized artifacts from a CountVectorizer + binary linear model.
+
+    Features whose absolute weight is below ``prune`` times the largest
+    absolute weight are dropped from the vocabulary.
+    """
+    vectorizer, classifier = split_artifacts(artifacts)
+    if type(vectorizer) is not CountVectorizer:
+        raise ValueError(f"Only CountVectorizer can be quantized, got {type(vectorizer).__name__}")
+    if getattr(classifier, 'coef_', None) is None or classifier.coef_.shape[0] != 1:
+        raise ValueError("Only binary linear classifiers can be quantized")
+
+    coef = classifier.coef_[0]
+    keep = np.abs(coef) >= prune * np.abs(coef).max()
+    terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+    kept_terms = [term for term, kept in zip(terms, keep) if kept]
+    # Stored as the fitted term -> column dict so loading needs no rebuild
+    vocabulary = {term: column for column, term in enumerate(kept_terms)}
+    kept_coef = coef[keep]
+
+    if dtype == 'int8':
+        scale = np.abs(kept_coef).max() / 127.0
+        weights = np.round(kept_coef / scale).astype(np.int8)
+    elif dtype == 'float32':
+        scale = 1.0
+        weights = kept_coef.astype(np.float32)
+    else:
+        raise ValueError(f"Unsupported dtype: {dtype}")
+
+    vectorizer_params = {key: value for key, value in vectorizer.get_params().items()
+                         if key not in FIT_ONLY_PARAMS}
+    metadata = dict(artifacts.get('metadata', {}))
+    metadata.update({
+        'quantization': dtype,
+        'features': len(vocabulary),
+        'pruned_features': int(len(coef) - len(vocabulary))
+    })
+    return {
+        'format': QUANTIZED_FORMAT,
+        'vocabulary': vocabulary,
+        'vectorizer_params': vectorizer_params,
+        'weights': weights,
+        'scale': float(scale),
+        'intercept': float(classifier.intercept_[0]),
+        'classes': list(classifier.classes_),
+        'metadata': metadata
+    }
+
+
+def load_quantized(artifacts):
+    """Rebuild (vectorizer, model) from quantized artifacts"""
+    vocabulary = artifacts['vocabulary']
+    if not isinstance(vocabulary, dict):
+        # Early exports stored the terms as a list in column order
+        vocabulary = {term: column for column, term in enumerate(vocabulary)}
+    # Set the fitted vocabulary directly; passing vocabulary= would re-validate it on first use
+    vectorizer = CountVectorizer(**artifacts['vectorizer_params'])
+    vectorizer.vocabulary_ = vocabulary
+    vectorizer.fixed_vocabulary_ = True
+    model = QuantizedLinearModel(artifacts['weights'], artifacts['scale'],
+                                 artifacts['intercept'], artifacts['classes'])
+    return vectorizer, model
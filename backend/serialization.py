@@ -0,0 +1,91 @@
+import json
+from fastapi.responses import JSONResponse, Response
+
+# Optional fast encoders - fall back to the stdlib when not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+# Index positions used by the columnar ``labels`` array
+CLASSES = ['REAL', 'FAKE']
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson when available"""
+
+    def render(self, content):
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+
+class MsgPackResponse(Response):
+    """Binary response encoded with msgpack"""
+    media_type = "application/msgpack"
+
+    def render(self, content):
+        return msgpack.packb(content, use_bin_type=True)
+
+
+def parse_accept(accept):
+    """Map each media range in an Accept header to its quality value"""
+    ranges = {}
+    for part in accept.split(','):
+        media_type, *params = [piece.strip() for piece in part.split(';')]
+        if not media_type:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = min(max(float(value), 0.0), 1.0)
+                except ValueError:
+                    quality = 0.0
+        media_type = media_type.lower()
+        ranges[media_type] = max(quality, ranges.get(media_type, 0.0))
+    return ranges
+
+
+def wants_msgpack(accept):
+    """Check whether an Accept header prefers msgpack over JSON"""
+    if msgpack is None or not accept:
+        return False
+    ranges = parse_accept(accept)
+    msgpack_quality = max(ranges.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES)
+    if msgpack_quality <= 0:
+        return False
+    # JSON is acceptable through its own type or the most specific wildcard that covers it
+    for media_type in ("application/json", "application/*", "*/*"):
+        if media_type in ranges:
+            return msgpack_quality >= ranges[media_type]
+    return True
+
+
+def render(content, accept=None):
+    """Pick the response encoder from the request's Accept header"""
+    if wants_msgpack(accept):
+        return MsgPackResponse(content)
+    return FastJSONResponse(content)
+
+
+def to_columnar(results):
+    """Convert per-item prediction dicts into parallel arrays"""
+    return {
+        'classes': CLASSES,
+        'labels': [result['prediction'] for result in results],
+        'fake_probabilities': [result['probabilities']['fake'] for result in results],
+    }
@@ -0,0 +1,192 @@
+import glob
+import json
+import os
+import threading
+import time
+import zlib
+import numpy as np
+
+
+class CountMinSketch:
+    """Count-min sketch with stable hashing so sketches merge across processes"""
+
+    def __init__(self, width=2048, depth=4, table=None):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64) if table is None else table
+
+    def _cells(self, key):
+        data = key.encode('utf-8')
+        # crc32 seeded with the row number gives one hash function per row
+        return [zlib.crc32(data, row) % self.width for row in range(self.depth)]
+
+    def add(self, key, count=1):
+        """Increment key and return its new estimate"""
+        estimate = None
+        for row, cell in enumerate(self._cells(key)):
+            self.table[row, cell] += count
+            value = int(self.table[row, cell])
+            estimate = value if estimate is None else min(estimate, value)
+        return estimate
+
+    def estimate(self, key):
+        return int(min(self.table[row, cell] for row, cell in enumerate(self._cells(key))))
+
+    def merge(self, other):
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Cannot merge count-min sketches of different shapes")
+        self.table += other.table
+
+
+class DriftTelemetry:
+    """Constant-memory input drift sketches for one worker.
+
+    Tracks the out-of-vocabulary token rate per request, a count-min sketch
+    of unseen stems with a small heavy-hitter candidate set, and a histogram
+    of predicted fake-probability. Snapshots from several workers merge by
+    adding their counters.
+    """
+
+    def __init__(self, bins=20, top_k=50, width=2048, depth=4,
+                 snapshot_dir=None, snapshot_interval=60.0):
+        self.bins = bins
+        self.top_k = top_k
+        self.unseen = CountMinSketch(width, depth)
+        self.candidates = {}
+        # Smallest candidate count; may lag behind, which only costs an extra scan
+        self._floor = 0
+        self.oov_histogram = np.zeros(bins, dtype=np.int64)
+        self.fake_histogram = np.zeros(bins, dtype=np.int64)
+        self.requests = 0
+        self.tokens = 0
+        self.oov_tokens = 0
+
+        self.snapshot_dir = snapshot_dir
+        self.snapshot_interval = snapshot_interval
+        self._next_snapshot = time.monotonic() + snapshot_interval
+        self._lock = threading.Lock()
+        # Serializes snapshot files only; never held together with _lock
+        self._write_lock = threading.Lock()
+
+    def _bin(self, value):
+        # NaN or out-of-range values land in the edge bins rather than raising
+        if not value > 0:
+            return 0
+        return min(int(value * self.bins), self.bins - 1)
+
+    def _track_candidate(self, stem, count):
+        if stem in self.candidates or len(self.candidates) < self.top_k:
+            self.candidates[stem] = count
+            return
+        if count <= self._floor:
+            return
+        weakest = min(self.candidates, key=self.candidates.get)
+        if count > self.candidates[weakest]:
+            del self.candidates[weakest]
+            self.candidates[stem] = count
+        self._floor = min(self.candidates.values())
+
+    def observe(self, processed_text, fake_probability, vocabulary):
+        """Record one scored request; vocabulary may be None if unknown"""
+        tokens = processed_text.split()
+        unseen = [] if vocabulary is None else [token for token in tokens if token not in vocabulary]
+        snapshot = None
+        with self._lock:
+            self.requests += 1
+            self.fake_histogram[self._bin(fake_probability)] += 1
+            if vocabulary is not None and tokens:
+                self.tokens += len(tokens)
+                self.oov_tokens += len(unseen)
+                self.oov_histogram[self._bin(len(unseen) / len(tokens))] += 1
+                for stem in unseen:
+                    self._track_candidate(stem, self.unseen.add(stem))
+
+            if self.snapshot_dir and time.monotonic() >= self._next_snapshot:
+                self._next_snapshot = time.monotonic() + self.snapshot_interval
+                snapshot = self._snapshot()
+
+        # File I/O happens outside the lock so other requests never wait on it
+        if snapshot is not None:
+            self._write_snapshot(snapshot)
+
+    def snapshot(self):
+        with self._lock:
+            return self._snapshot()
+
+    def _snapshot(self):
+        return {
+            'pid': os.getpid(),
+            'timestamp': time.time(),
+            'requests': self.requests,
+            'tokens': self.tokens,
+            'oov_tokens': self.oov_tokens,
+            'oov_histogram': self.oov_histogram.tolist(),
+            'fake_histogram': self.fake_histogram.tolist(),
+            'unseen_sketch': self.unseen.table.tolist(),
+            'unseen_candidates': sorted(self.candidates)
+        }
+
+    def _write_snapshot(self, snapshot):
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        path = os.path.join(self.snapshot_dir, f"telemetry-{os.getpid()}.json")
+        # Write then rename so readers never see a partial file
+        with self._write_lock:
+            with open(path + '.tmp', 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(path + '.tmp', path)
+
+    def write_snapshot(self):
+        self._write_snapshot(self.snapshot())
+
+
+def merge_snapshots(snapshots, top_k=50):
+    """Combine per-worker snapshots into one summary"""
+    snapshots = [snapshot for snapshot in snapshots if snapshot]
+    if not snapshots:
+        return {'workers': 0, 'requests': 0}
+
+    sketch = None
+    candidates = set()
+    oov_histogram = fake_histogram = None
+    for snapshot in snapshots:
+        table = np.asarray(snapshot['unseen_sketch'], dtype=np.int64)
+        other = CountMinSketch(table.shape[1], table.shape[0], table)
+        if sketch is None:
+            sketch = CountMinSketch(other.width, other.depth, table.copy())
+        else:
+            sketch.merge(other)
+        candidates.update(snapshot['unseen_candidates'])
+        oov = np.asarray(snapshot['oov_histogram'], dtype=np.int64)
+        fake = np.asarray(snapshot['fake_histogram'], dtype=np.int64)
+        oov_histogram = oov if oov_histogram is None else oov_histogram + oov
+        fake_histogram = fake if fake_histogram is None else fake_histogram + fake
+
+    tokens = sum(snapshot['tokens'] for snapshot in snapshots)
+    oov_tokens = sum(snapshot['oov_tokens'] for snapshot in snapshots)
+    top_unseen = sorted(((stem, sketch.estimate(stem)) for stem in candidates),
+                        key=lambda item: item[1], reverse=True)[:top_k]
+    return {
+        'workers': len(snapshots),
+        'requests': sum(snapshot['requests'] for snapshot in snapshots),
+        'oov_rate': oov_tokens / tokens if tokens else None,
+        'oov_histogram': oov_histogram.tolist(),
+        'fake_probability_histogram': fake_histogram.tolist(),
+        'top_unseen_stems': [{'stem': stem, 'count': count} for stem, count in top_unseen]
+    }
+
+
+def read_snapshots(snapshot_dir, exclude_pid=None, max_age=None):
+    """Load snapshot files written by other workers, skipping stale ones"""
+    snapshots = []
+    for path in glob.glob(os.path.join(snapshot_dir, "telemetry-*.json")):
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if snapshot.get('pid') == exclude_pid:
+            continue
+        if max_age is not None and time.time() - snapshot.get('timestamp', 0) > max_age:
+            continue
+        snapshots.append(snapshot)
+    return snapshots
@@ -0,0 +1,166 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from fake_news_detector import FakeNewsDetector
+import serialization
+from prediction_cache import PredictionCache
+from near_duplicate import NearDuplicateIndex
+from telemetry import DriftTelemetry
+from loadtest import synthetic_headlines
+
+SAMPLE_TEXTS = [
+    "Breaking: shocking revelation about the president leaked online",
+    "Government releases official statement on new trade policy",
+    "Scientists confirm results of long-running climate study",
+    "You won't believe what this celebrity said about vaccines",
+    "Senate passes budget bill after lengthy debate",
+]
+
+
+def find_model():
+    for model_path in ['models/fake_news_model.pkl', 'backend/models/fake_news_model.pkl',
+                       'models/fake_news_model.joblib', 'backend/models/fake_news_model.joblib']:
+        if os.path.exists(model_path):
+            return model_path
+    return None
+
+
+def time_per_item(func, n_items, repeat):
+    """Best-of-repeat wall time of func(), divided by n_items, in microseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best / n_items * 1e6
+
+
+def bench_predict(detector, texts, repeat):
+    def run():
+        for text in texts:
+            detector.predict(text)
+    return time_per_item(run, len(texts), repeat)
+
+
+def bench_cache_read(detector, texts, repeat):
+    """Warm persistent-cache read latency for preprocessed texts"""
+    processed_texts = [detector.preprocess_text(text) for text in texts]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = PredictionCache(os.path.join(tmp, 'predictions.db'))
+        cache.put_many(detector.model_version, [(text, 1, 0.9) for text in processed_texts])
+
+        def run():
+            for text in processed_texts:
+                cache.get(detector.model_version, text)
+        us = time_per_item(run, len(processed_texts), repeat)
+        cache.close()
+    return us
+
+
+def bench_near_duplicate(detector, index_size, queries, repeat, seed=0):
+    """Near-duplicate lookup latency against an index of index_size distinct texts.
+
+    Indexed texts are synthetic headlines plus random vocabulary stems, so
+    buckets fill the way they would with real traffic. Half of the queries are
+    lightly edited copies of indexed texts, the other half are unseen.
+    """
+    rng = random.Random(seed)
+    stems = [term for term in detector._vocabulary() or [] if ' ' not in term] or ['news']
+    headlines = [detector.preprocess_text(text) for text in synthetic_headlines(5000, seed)]
+
+    def distinct_text():
+        return ' '.join([rng.choice(headlines)] + rng.sample(stems, min(6, len(stems))))
+
+    indexed = [distinct_text() for _ in range(index_size)]
+    index = NearDuplicateIndex(max_entries=index_size)
+    index.add_many([(text, 1, 0.9) for text in indexed])
+
+    probes = []
+    for _ in range(queries // 2):
+        tokens = rng.choice(indexed).split()
+        del tokens[rng.randrange(len(tokens))]
+        probes.append(' '.join(tokens))
+    probes += [distinct_text() for _ in range(queries - len(probes))]
+
+    def run():
+        index.query_many(probes)
+    us = time_per_item(run, len(probes), repeat)
+    hits = sum(match is not None for match in index.query_many(probes))
+    return us, len(index), hits / len(probes)
+
+
+def bench_telemetry(detector, texts, repeat):
+    """Per-request cost of updating the drift sketches"""
+    processed_texts = [detector.preprocess_text(text) for text in texts]
+    vocabulary = detector._vocabulary()
+    telemetry = DriftTelemetry()
+
+    def run():
+        for text in processed_texts:
+            telemetry.observe(text, 0.7, vocabulary)
+    return time_per_item(run, len(processed_texts), repeat)
+
+
+def bench_serialization(results, repeat):
+    """Serialization time per item for every format / encoder pair"""
+    payloads = {
+        'records': {"success": True, "results": results},
+        'columnar': {"success": True, "results": serialization.to_columnar(results)},
+    }
+    encoders = {'json': lambda content: json.dumps(content).encode('utf-8')}
+    if serialization.orjson is not None:
+        encoders['orjson'] = serialization.orjson.dumps
+    if serialization.msgpack is not None:
+        encoders['msgpack'] = lambda content: serialization.msgpack.packb(content, use_bin_type=True)
+
+    rows = []
+    for format_name, payload in payloads.items():
+        for encoder_name, encode in encoders.items():
+            us = time_per_item(lambda: encode(payload), len(results), repeat)
+            rows.append((format_name, encoder_name, us, len(encode(payload)) / len(results)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prediction and response serialization")
+    parser.add_argument('--model', default=None, help="Model path (auto-detected by default)")
+    parser.add_argument('--items', type=int, default=10000, help="Batch size to serialize")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--index-size', type=int, default=100_000,
+                        help="Distinct texts in the near-duplicate index")
+    args = parser.parse_args()
+
+    model_path = args.model or find_model()
+    if model_path is None:
+        print("❌ No model found")
+        return False
+    detector = FakeNewsDetector(model_path)
+
+    texts = [SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)] for i in range(args.items)]
+
+    print(f"📊 Benchmarking {args.items} items (best of {args.repeat})")
+    predict_texts = texts[:min(len(texts), 1000)]
+    print(f"predict:        {bench_predict(detector, predict_texts, args.repeat):10.2f} us/item")
+    print(f"cache read:     {bench_cache_read(detector, predict_texts, args.repeat):10.2f} us/item")
+    us, indexed, hit_rate = bench_near_duplicate(detector, args.index_size, 1000, args.repeat)
+    print(f"near-duplicate: {us:10.2f} us/item ({indexed} indexed, {hit_rate:.0%} of queries matched)")
+    print(f"telemetry:      {bench_telemetry(detector, predict_texts, args.repeat):10.2f} us/item")
+
+    sample_results = [detector.predict(text) for text in SAMPLE_TEXTS]
+    results = [dict(sample_results[i % len(sample_results)]) for i in range(args.items)]
+    print(f"{'format':<10} {'encoder':<8} {'us/item':>10} {'bytes/item':>11}")
+    for format_name, encoder_name, us, size in bench_serialization(results, args.repeat):
+        print(f"{format_name:<10} {encoder_name:<8} {us:10.3f} {size:11.1f}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,106 @@
+import os
+import sys
+import time
+import pickle
+import argparse
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from fake_news_detector import FakeNewsDetector
+from quantized_model import quantize_artifacts
+from prefill_cache import read_corpus, parse_label
+
+
+def load_artifacts(model_path):
+    if model_path.endswith('.joblib'):
+        return joblib.load(model_path)
+    with open(model_path, 'rb') as f:
+        return pickle.load(f)
+
+
+def timed_load(model_path):
+    start = time.perf_counter()
+    detector = FakeNewsDetector(model_path)
+    return detector, time.perf_counter() - start
+
+
+def parity_report(original_path, quantized_path, holdout_path, text_field, label_field):
+    """Score a held-out file with both models and compare the verdicts"""
+    records = [record for record in read_corpus(holdout_path) if record.get(text_field)]
+    texts = [record[text_field] for record in records]
+    labels = [parse_label(record.get(label_field)) for record in records]
+
+    original, original_load = timed_load(original_path)
+    quantized, quantized_load = timed_load(quantized_path)
+    original_results = original.predict_batch(texts)
+    quantized_results = quantized.predict_batch(texts)
+
+    original_fake = np.array([result['probabilities']['fake'] for result in original_results])
+    quantized_fake = np.array([result['probabilities']['fake'] for result in quantized_results])
+    original_pred = np.array([result['prediction'] for result in original_results])
+    quantized_pred = np.array([result['prediction'] for result in quantized_results])
+
+    print("📋 Parity report")
+    print(f"  Held-out texts:        {len(texts)}")
+    print(f"  Artifact size:         {os.path.getsize(original_path):,} -> {os.path.getsize(quantized_path):,} bytes")
+    print(f"  Load time:             {original_load * 1000:.1f} -> {quantized_load * 1000:.1f} ms")
+    labeled = np.array([label is not None for label in labels])
+    if labeled.any():
+        truth = np.array([label for label in labels if label is not None])
+        print(f"  Accuracy (original):   {np.mean(original_pred[labeled] == truth):.4f}")
+        print(f"  Accuracy (quantized):  {np.mean(quantized_pred[labeled] == truth):.4f}")
+    else:
+        print("  Accuracy:              n/a (no labels in held-out file)")
+    if len(texts):
+        print(f"  Max probability delta: {np.max(np.abs(original_fake - quantized_fake)):.6f}")
+    print(f"  Label flips:           {int(np.sum(original_pred != quantized_pred))}")
+    return int(np.sum(original_pred != quantized_pred))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a reduced-precision model artifact")
+    parser.add_argument('--model', default='backend/models/fake_news_model.pkl')
+    parser.add_argument('--output', default=None, help="Defaults to models/fake_news_model.<dtype>.pkl")
+    parser.add_argument('--dtype', choices=['float32', 'int8'], default='float32')
+    parser.add_argument('--prune', type=float, default=0.001,
+                        help="Drop features with |weight| below this fraction of the largest weight")
+    parser.add_argument('--holdout', default=None, help="CSV or JSONL file to run the parity report on")
+    parser.add_argument('--text-field', default='text')
+    parser.add_argument('--label-field', default='label')
+    parser.add_argument('--max-flips', type=int, default=None,
+                        help="Exit non-zero if the parity report shows more label flips than this")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.model):
+        print(f"❌ Model not found: {args.model}")
+        return False
+    output = args.output or f"models/fake_news_model.{args.dtype}.pkl"
+
+    print(f"🔧 Quantizing {args.model} to {args.dtype}...")
+    quantized = quantize_artifacts(load_artifacts(args.model), dtype=args.dtype, prune=args.prune)
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    # Plain pickle: joblib's pure-Python unpickler dominates load time for a dict vocabulary
+    if output.endswith('.joblib'):
+        joblib.dump(quantized, output)
+    else:
+        with open(output, 'wb') as f:
+            pickle.dump(quantized, f, protocol=pickle.HIGHEST_PROTOCOL)
+    metadata = quantized['metadata']
+    print(f"✅ Saved {output} ({metadata['features']} features kept, "
+          f"{metadata['pruned_features']} pruned)")
+
+    if args.holdout:
+        flips = parity_report(args.model, output, args.holdout, args.text_field, args.label_field)
+        if args.max_flips is not None and flips > args.max_flips:
+            print(f"❌ {flips} label flips exceeds --max-flips {args.max_flips}")
+            return False
+    else:
+        print("⚠️ No --holdout given, skipping parity report")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,302 @@
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import threading
+import subprocess
+
+SUBJECTS = ["President", "Senate", "Scientists", "Celebrity doctor", "Local officials",
+            "Tech giant", "Health ministry", "Anonymous insider", "Central bank", "Police"]
+VERBS = ["announce", "deny", "confirm", "reveal", "warn about", "leak", "slam", "approve"]
+OBJECTS = ["new trade policy", "shocking vaccine secret", "climate study results",
+           "election fraud claims", "budget deal", "miracle cure", "moon landing cover-up",
+           "interest rate decision", "alien sighting", "infrastructure bill"]
+TAILS = ["", " after lengthy debate", " in leaked memo", " experts say", " you won't believe",
+         " on Tuesday", " according to sources"]
+
+
+def synthetic_headlines(count, seed=0):
+    rng = random.Random(seed)
+    return [f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)}{rng.choice(TAILS)}"
+            for _ in range(count)]
+
+
+def load_replay(path):
+    """Texts from a JSONL replay file.
+
+    Lines may carry ``text``, a ``texts`` list, or ``title``/``body`` fields
+    (as in requests.jsonl), which are joined into one text.
+    """
+    texts = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if 'texts' in record:
+                texts.extend(record['texts'])
+            elif 'text' in record:
+                texts.append(record['text'])
+            else:
+                text = ' '.join(record.get(key, '') for key in ('title', 'body')).strip()
+                if text:
+                    texts.append(text)
+    return texts
+
+
+class Connection:
+    """Minimal keep-alive HTTP/1.1 client, cheap enough not to skew results"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def post(self, path, body):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(
+            f"POST {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+        )
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length, close = 0, False
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.lower() == 'content-length':
+                length = int(value)
+            elif name.lower() == 'connection' and value.strip().lower() == 'close':
+                close = True
+        body = await self.reader.readexactly(length)
+        if close:
+            self.close()
+        return status, body
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class Workload:
+    def __init__(self, texts, endpoint, batch_size):
+        self.texts = texts
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self._next = 0
+
+    def next_request(self):
+        """Path and encoded body for the next request, cycling through the texts"""
+        if self.endpoint == 'batch':
+            texts = [self.texts[(self._next + i) % len(self.texts)] for i in range(self.batch_size)]
+            self._next += self.batch_size
+            return "/api/batch-predict", json.dumps({"texts": texts}).encode('utf-8')
+        text = self.texts[self._next % len(self.texts)]
+        self._next += 1
+        return "/api/predict", json.dumps({"text": text}).encode('utf-8')
+
+
+async def send(connection, workload, latencies, errors, scheduled=None):
+    path, body = workload.next_request()
+    start = time.perf_counter() if scheduled is None else scheduled
+    try:
+        status, response = await connection.post(path, body)
+        # The API reports handled failures as 200 with success: false
+        if status != 200 or not json.loads(response).get('success', False):
+            errors.append(status)
+    except (OSError, asyncio.IncompleteReadError, IndexError, ValueError):
+        connection.close()
+        errors.append(0)
+    latencies.append(time.perf_counter() - start)
+
+
+async def closed_loop(host, port, workload, concurrency, duration):
+    """Each of `concurrency` clients sends its next request as soon as the last returns"""
+    latencies, errors = [], []
+    stop_at = time.perf_counter() + duration
+
+    async def client():
+        connection = Connection(host, port)
+        while time.perf_counter() < stop_at:
+            await send(connection, workload, latencies, errors)
+        connection.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(concurrency)])
+    return latencies, errors, time.perf_counter() - start
+
+
+async def open_loop(host, port, workload, rate, duration):
+    """Fixed arrival rate; latency counts from the scheduled send time"""
+    latencies, errors = [], []
+    idle = []
+    tasks = []
+
+    async def fire(scheduled):
+        connection = idle.pop() if idle else Connection(host, port)
+        await send(connection, workload, latencies, errors, scheduled)
+        idle.append(connection)
+
+    start = time.perf_counter()
+    for i in range(int(rate * duration)):
+        scheduled = start + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(fire(scheduled)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    for connection in idle:
+        connection.close()
+    return latencies, errors, elapsed
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return float('nan')
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def summarize(level, latencies, errors, elapsed):
+    ordered = sorted(latencies)
+    return {
+        'level': level,
+        'requests': len(latencies),
+        'throughput': (len(latencies) - len(errors)) / elapsed if elapsed else 0.0,
+        'p50': percentile(ordered, 0.50) * 1000,
+        'p95': percentile(ordered, 0.95) * 1000,
+        'p99': percentile(ordered, 0.99) * 1000,
+        'error_rate': len(errors) / len(latencies) if latencies else 0.0
+    }
+
+
+def print_table(mode, rows, target_p99):
+    level_name = 'rate' if mode == 'open' else 'conc'
+    print(f"\n{level_name:>8} {'requests':>9} {'ok req/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'errors':>7}")
+    for row in rows:
+        print(f"{row['level']:>8} {row['requests']:>9} {row['throughput']:>9.1f} {row['p50']:>8.1f} "
+              f"{row['p95']:>8.1f} {row['p99']:>8.1f} {row['error_rate']:>6.1%}")
+
+    passing = [row for row in rows if row['p99'] <= target_p99 and row['error_rate'] < 0.01]
+    if passing:
+        best = max(passing, key=lambda row: row['throughput'])
+        print(f"\n✅ Capacity at p99 <= {target_p99:.0f} ms: {best['throughput']:.1f} req/s "
+              f"({level_name} {best['level']})")
+    else:
+        print(f"\n❌ No level met p99 <= {target_p99:.0f} ms with < 1% errors")
+
+
+def wait_ready(host, port, timeout):
+    """Poll /ready until the instance is warm"""
+    import urllib.request
+    import urllib.error
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://{host}:{port}/ready", timeout=2) as response:
+                if response.status == 200:
+                    return True
+        except (urllib.error.URLError, OSError):
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def start_server(mode, host, port):
+    """Start main:app in a subprocess or a background thread; returns a stop function"""
+    if mode == 'subprocess':
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", host, "--port", str(port),
+             "--log-level", "warning"],
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+
+        def stop():
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        return stop
+
+    import uvicorn
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    server = uvicorn.Server(uvicorn.Config("main:app", host=host, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    def stop():
+        server.should_exit = True
+        thread.join(timeout=10)
+    return stop
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP load test and capacity report for main:app")
+    parser.add_argument('--server', choices=['subprocess', 'inprocess', 'external'], default='subprocess',
+                        help="How to run the app; 'external' targets an already running instance")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=18000)
+    parser.add_argument('--mode', choices=['closed', 'open'], default='closed')
+    parser.add_argument('--levels', default=None,
+                        help="Comma-separated concurrency levels (closed) or req/s rates (open)")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds per level")
+    parser.add_argument('--endpoint', choices=['predict', 'batch'], default='predict')
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--replay', default=None, help="JSONL replay file (text, texts or title/body)")
+    parser.add_argument('--synthetic', type=int, default=1000, help="Synthetic headlines when no replay file")
+    parser.add_argument('--target-p99', type=float, default=200.0, help="Target p99 latency in ms")
+    args = parser.parse_args()
+
+    texts = load_replay(args.replay) if args.replay else synthetic_headlines(args.synthetic)
+    if not texts:
+        print("❌ No request texts to send")
+        return False
+    default_levels = '1,2,4,8,16,32' if args.mode == 'closed' else '10,25,50,100,200'
+    levels = [float(level) if args.mode == 'open' else int(level)
+              for level in (args.levels or default_levels).split(',')]
+
+    stop = None
+    if args.server != 'external':
+        print(f"🚀 Starting main:app ({args.server}) on {args.host}:{args.port}...")
+        if args.server == 'inprocess':
+            print("⚠️ inprocess mode shares the GIL with the load generator; "
+                  "use subprocess for capacity numbers")
+        stop = start_server(args.server, args.host, args.port)
+    try:
+        if not wait_ready(args.host, args.port, timeout=120):
+            print("❌ Server did not become ready")
+            return False
+
+        print(f"📊 {args.mode}-loop {args.endpoint} load, {len(texts)} texts, "
+              f"{args.duration:.0f}s per level")
+        rows = []
+        for level in levels:
+            workload = Workload(texts, args.endpoint, args.batch_size)
+            if args.mode == 'closed':
+                result = asyncio.run(closed_loop(args.host, args.port, workload, level, args.duration))
+            else:
+                result = asyncio.run(open_loop(args.host, args.port, workload, level, args.duration))
+            rows.append(summarize(level, *result))
+            print(f"  finished level {level}")
+        print_table(args.mode, rows, args.target_p99)
+    finally:
+        if stop is not None:
+            stop()
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -1,21 +1,44 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
-from pydantic import BaseModel
-from typing import List
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Literal
+from contextlib import asynccontextmanager
+import asyncio
 import os
 import sys
+import time
 
 # Add backend to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
 
 from fake_news_detector import FakeNewsDetector
+from prediction_cache import PredictionCache
+from near_duplicate import NearDuplicateIndex
+from telemetry import DriftTelemetry, merge_snapshots, read_snapshots
+from serialization import FastJSONResponse, render, to_columnar
+from admission import AdmissionController, RequestDropped, request_deadline
+
+# Startup progress: loading -> warming -> ready (or failed if loading or warmup fails)
+startup_state = {"status": "loading", "warmup_seconds": None, "warmup_texts": 0, "error": None}
+
+@asynccontextmanager
+async def lifespan(app):
+    # Load in the background so /health answers while the model warms up
+    startup_task = asyncio.create_task(startup())
+    yield
+    startup_task.cancel()
+    if telemetry is not None and telemetry_dir:
+        telemetry.write_snapshot()
 
 app = FastAPI(
     title="Fake News Detection API",
     description="AI-powered fake news detection system",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -27,85 +50,228 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Load shedding limits
+MAX_BATCH_TEXTS = int(os.environ.get("MAX_BATCH_TEXTS", 10_000))
+MAX_BATCH_CHARS = int(os.environ.get("MAX_BATCH_CHARS", 5_000_000))
+REQUEST_DEADLINE = float(os.environ.get("REQUEST_DEADLINE", 30))
+QUEUE_TIMEOUT = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", 5))
+# Batches are scored in chunks so expired requests stop early
+BATCH_CHUNK_SIZE = 256
+
+predict_admission = AdmissionController(
+    "predict",
+    max_concurrency=int(os.environ.get("PREDICT_MAX_CONCURRENCY", 8)),
+    max_queue=int(os.environ.get("PREDICT_MAX_QUEUE", 64)),
+    queue_timeout=QUEUE_TIMEOUT
+)
+batch_admission = AdmissionController(
+    "batch-predict",
+    max_concurrency=int(os.environ.get("BATCH_MAX_CONCURRENCY", 2)),
+    max_queue=int(os.environ.get("BATCH_MAX_QUEUE", 8)),
+    queue_timeout=QUEUE_TIMEOUT
+)
+
 # Request models
 class PredictionRequest(BaseModel):
     text: str
 
 class BatchPredictionRequest(BaseModel):
-    texts: List[str]
+    texts: List[str] = Field(max_length=MAX_BATCH_TEXTS)
+    # "columnar" returns parallel label / fake-probability arrays
+    format: Literal['records', 'columnar'] = 'records'
+
+    @field_validator('texts')
+    @classmethod
+    def check_total_chars(cls, texts):
+        if sum(len(text) for text in texts) > MAX_BATCH_CHARS:
+            raise ValueError(f"Total text length exceeds {MAX_BATCH_CHARS} characters")
+        return texts
+
+# Optional persistent prediction cache shared by all workers on the host
+prediction_cache = None
+cache_path = os.environ.get("PREDICTION_CACHE_PATH")
+if cache_path:
+    try:
+        prediction_cache = PredictionCache(
+            cache_path,
+            max_entries=int(os.environ.get("PREDICTION_CACHE_MAX_ENTRIES", 1_000_000))
+        )
+        print(f"Prediction cache enabled at: {cache_path}")
+    except Exception as e:
+        print(f"Error opening prediction cache {cache_path}: {e}")
+
+# Optional near-duplicate index reusing verdicts for lightly edited copies
+near_duplicates = None
+near_duplicate_threshold = os.environ.get("NEAR_DUPLICATE_THRESHOLD")
+if near_duplicate_threshold:
+    near_duplicates = NearDuplicateIndex(
+        threshold=float(near_duplicate_threshold),
+        ttl=float(os.environ.get("NEAR_DUPLICATE_TTL", 86400)),
+        max_entries=int(os.environ.get("NEAR_DUPLICATE_MAX_ENTRIES", 100_000))
+    )
+    print(f"Near-duplicate index enabled (threshold {near_duplicate_threshold})")
+
+# Input drift telemetry, on unless TELEMETRY=0; TELEMETRY_DIR shares snapshots across workers
+telemetry = None
+telemetry_dir = os.environ.get("TELEMETRY_DIR")
+TELEMETRY_MAX_AGE = float(os.environ.get("TELEMETRY_MAX_AGE", 86400))
+if os.environ.get("TELEMETRY", "1") != "0":
+    telemetry = DriftTelemetry(
+        snapshot_dir=telemetry_dir,
+        snapshot_interval=float(os.environ.get("TELEMETRY_SNAPSHOT_INTERVAL", 60))
+    )
+
+def load_detector():
+    """Load the model, falling back to a tiny demo model if none is found"""
+    print("Initializing Fake News Detector...")
+    detector = None
 
-# Initialize model
-print("Initializing Fake News Detector...")
+    try:
+        # Try multiple model paths (prioritize .pkl files)
+        possible_paths = [
+            # Explicit artifact, e.g. a quantized export
+            os.environ.get("MODEL_PATH", ""),
+            'models/fake_news_model.pkl',
+            'backend/models/fake_news_model.pkl',
+            'models/fake_news_model.joblib',
+            'backend/models/fake_news_model.joblib',
+        ]
+
+        model_loaded = False
+        for model_path in possible_paths:
+            if os.path.exists(model_path):
+                print(f"Found model at: {model_path}")
+                try:
+                    detector = FakeNewsDetector(model_path, cache=prediction_cache,
+                                                near_duplicates=near_duplicates,
+                                                telemetry=telemetry)
+                    model_loaded = True
+                    print("Model loaded successfully!")
+                    break
+                except Exception as e:
+                    print(f"Error loading {model_path}: {e}")
+                    continue
+
+        if not model_loaded:
+            print("WARNING: No model found, creating fallback...")
+            # Create fallback detector directly
+            from sklearn.feature_extraction.text import CountVectorizer
+            from sklearn.linear_model import LogisticRegression
+            from sklearn.pipeline import Pipeline
+
+            texts = ["breaking news amazing", "shocking revelation", "official statement", "research confirms"]
+            labels = [1, 1, 0, 0]
+
+            fallback_pipeline = Pipeline([
+                ('vectorizer', CountVectorizer()),
+                ('classifier', LogisticRegression())
+            ])
+            fallback_pipeline.fit(texts, labels)
+
+            # Create a minimal detector-like object
+            class FallbackDetector:
+                def __init__(self, model):
+                    self.model = model
+                    self.metadata = {'model_type': 'Fallback', 'accuracy': 0.75}
+
+                def predict(self, text):
+                    try:
+                        pred = self.model.predict([text])[0]
+                        proba = self.model.predict_proba([text])[0]
+                        return {
+                            'prediction': int(pred),
+                            'confidence': float(max(proba)),
+                            'class': 'FAKE' if pred == 1 else 'REAL',
+                            'probabilities': {'real': float(proba[0]), 'fake': float(proba[1])}
+                        }
+                    except:
+                        return {'prediction': 0, 'confidence': 0.5, 'class': 'REAL',
+                               'probabilities': {'real': 0.5, 'fake': 0.5}}
+
+                def get_model_info(self):
+                    return self.metadata
+
+            detector = FallbackDetector(fallback_pipeline)
+            print("Fallback model created successfully!")
+
+    except Exception as e:
+        print(f"Error during initialization: {e}")
+        print("WARNING: Could not create detector, using None")
+        detector = None
+
+    return detector
+
+# Detector is loaded by the lifespan startup task
 detector = None
 
-try:
-    # Try multiple model paths (prioritize .pkl files)
-    possible_paths = [
-        'models/fake_news_model.pkl',
-        'backend/models/fake_news_model.pkl',
-        'models/fake_news_model.joblib',
-        'backend/models/fake_news_model.joblib',
-    ]
-
-    model_loaded = False
-    for model_path in possible_paths:
-        if os.path.exists(model_path):
-            print(f"Found model at: {model_path}")
-            try:
-                detector = FakeNewsDetector(model_path)
-                model_loaded = True
-                print("Model loaded successfully!")
-                break
-            except Exception as e:
-                print(f"Error loading {model_path}: {e}")
-                continue
-
-    if not model_loaded:
-        print("WARNING: No model found, creating fallback...")
-        # Create fallback detector directly
-        from sklearn.feature_extraction.text import CountVectorizer
-        from sklearn.linear_model import LogisticRegression
-        from sklearn.pipeline import Pipeline
-
-        texts = ["breaking news amazing", "shocking revelation", "official statement", "research confirms"]
-        labels = [1, 1, 0, 0]
-
-        fallback_pipeline = Pipeline([
-            ('vectorizer', CountVectorizer()),
-            ('classifier', LogisticRegression())
-        ])
-        fallback_pipeline.fit(texts, labels)
-
-        # Create a minimal detector-like object
-        class FallbackDetector:
-            def __init__(self, model):
-                self.model = model
-                self.metadata = {'model_type': 'Fallback', 'accuracy': 0.75}
-
-            def predict(self, text):
-                try:
-                    pred = self.model.predict([text])[0]
-                    proba = self.model.predict_proba([text])[0]
-                    return {
-                        'prediction': int(pred),
-                        'confidence': float(max(proba)),
-                        'class': 'FAKE' if pred == 1 else 'REAL',
-                        'probabilities': {'real': float(proba[0]), 'fake': float(proba[1])}
-                    }
-                except:
-                    return {'prediction': 0, 'confidence': 0.5, 'class': 'REAL',
-                           'probabilities': {'real': 0.5, 'fake': 0.5}}
-
-            def get_model_info(self):
-                return self.metadata
-
-        detector = FallbackDetector(fallback_pipeline)
-        print("Fallback model created successfully!")
-
-except Exception as e:
-    print(f"Error during initialization: {e}")
-    print("WARNING: Could not create detector, using None")
-    detector = None
+WARMUP_TEXTS = [
+    "Breaking: shocking revelation about the president leaked online",
+    "Government releases official statement on new trade policy",
+    "Scientists confirm results of long-running climate study",
+    "You won't believe what this celebrity said about vaccines",
+    "Senate passes budget bill after lengthy debate",
+]
+
+def load_warmup_texts():
+    """Warmup corpus from WARMUP_CORPUS (one text per line) or built-in headlines"""
+    corpus_path = os.environ.get("WARMUP_CORPUS")
+    if corpus_path and os.path.exists(corpus_path):
+        with open(corpus_path, encoding='utf-8') as f:
+            texts = [line.strip() for line in f if line.strip()]
+        if texts:
+            return texts
+    return WARMUP_TEXTS
+
+def warmup(detector, texts):
+    """Run texts through the single and batch paths, bypassing the caches"""
+    cache = getattr(detector, 'cache', None)
+    near_duplicates = getattr(detector, 'near_duplicates', None)
+    telemetry = getattr(detector, 'telemetry', None)
+    # Cached hits would skip the model, leaving it cold; warmup texts are not real traffic
+    detector.cache, detector.near_duplicates, detector.telemetry = None, None, None
+    start = time.perf_counter()
+    try:
+        for text in texts:
+            detector.predict(text)
+        results = score_batch(texts)
+        render({"success": True, "results": results})
+        render({"success": True, "results": to_columnar(results)})
+        render({"success": True, "results": results}, "application/msgpack")
+    finally:
+        detector.cache, detector.near_duplicates, detector.telemetry = cache, near_duplicates, telemetry
+    return time.perf_counter() - start
+
+async def startup():
+    global detector
+    try:
+        detector = await run_in_threadpool(load_detector)
+        if detector is None:
+            startup_state["status"] = "failed"
+            startup_state["error"] = "No detector could be loaded"
+            return
+
+        startup_state["status"] = "warming"
+        texts = await run_in_threadpool(load_warmup_texts)
+        startup_state["warmup_seconds"] = await run_in_threadpool(warmup, detector, texts)
+        startup_state["warmup_texts"] = len(texts)
+        print(f"Warmup finished in {startup_state['warmup_seconds']:.2f}s ({len(texts)} texts)")
+        startup_state["status"] = "ready"
+    except Exception as e:
+        # A cold or broken instance must not be routed traffic, and must not look like it is still starting
+        print(f"Error during startup: {e}")
+        startup_state["status"] = "failed"
+        startup_state["error"] = str(e) or type(e).__name__
+    finally:
+        # Cancellation or a BaseException must not leave the instance stuck "starting"
+        if startup_state["status"] in ("loading", "warming"):
+            startup_state["status"] = "failed"
+            startup_state["error"] = startup_state["error"] or "Startup did not complete"
+
+def check_started():
+    """Reject predictions until the model has loaded and warmed up"""
+    if startup_state["status"] in ("loading", "warming"):
+        raise HTTPException(status_code=503, detail="Model is still loading",
+                            headers={"Retry-After": "5"})
 
 # API Routes
 @app.get("/api")
@@ -123,9 +289,39 @@ async def health_check():
     return {
         "status": "healthy",
         "model_loaded": detector is not None,
+        "startup": startup_state["status"],
         "service": "fake-news-detector"
     }
 
+@app.get("/ready")
+async def readiness_check():
+    ready = startup_state["status"] == "ready"
+    return FastJSONResponse({
+        "ready": ready,
+        "status": startup_state["status"],
+        "warmup_seconds": startup_state["warmup_seconds"],
+        "warmup_texts": startup_state["warmup_texts"],
+        "error": startup_state["error"]
+    }, status_code=200 if ready else 503)
+
+@app.get("/api/admission")
+async def admission_stats():
+    return {
+        "predict": predict_admission.stats(),
+        "batch_predict": batch_admission.stats()
+    }
+
+@app.get("/api/telemetry")
+async def telemetry_stats():
+    if telemetry is None:
+        return {"enabled": False}
+    snapshots = [telemetry.snapshot()]
+    if telemetry_dir:
+        # Other workers on the host publish their sketches as snapshot files
+        snapshots += read_snapshots(telemetry_dir, exclude_pid=os.getpid(),
+                                    max_age=TELEMETRY_MAX_AGE)
+    return {"enabled": True, **merge_snapshots(snapshots)}
+
 @app.get("/api/model/info")
 async def model_info():
     if detector:
@@ -137,14 +333,35 @@ async def model_info():
         "accuracy": 0.0
     }
 
+def score_batch(texts):
+    """Score texts with one model call where the detector supports it"""
+    if hasattr(detector, 'predict_batch'):
+        return detector.predict_batch(texts)
+    return [detector.predict(text) for text in texts]
+
+async def run_batch(texts, http_request, deadline):
+    """Score texts chunk by chunk, dropping the request once its client gives up"""
+    results = []
+    for start in range(0, len(texts), BATCH_CHUNK_SIZE):
+        if deadline.expired() or await http_request.is_disconnected():
+            raise RequestDropped()
+        results.extend(await run_in_threadpool(score_batch, texts[start:start + BATCH_CHUNK_SIZE]))
+    return results
+
 @app.post("/api/predict")
-async def predict(request: PredictionRequest):
+async def predict(request: PredictionRequest, http_request: Request):
+    check_started()
+    deadline = request_deadline(http_request, REQUEST_DEADLINE)
+    async with predict_admission.admit(http_request, deadline):
+        return await _predict(request, http_request)
+
+async def _predict(request, http_request):
     try:
         if not request.text.strip():
             raise HTTPException(status_code=400, detail="Text cannot be empty")
 
         if detector:
-            result = detector.predict(request.text)
+            result = await run_in_threadpool(detector.predict, request.text)
         else:
             # Simple fallback
             result = {
@@ -155,28 +372,32 @@ async def predict(request: PredictionRequest):
                 'note': 'No model loaded - using default response'
             }
 
-        return {
+        return render({
             "success": True,
             "result": result
-        }
+        }, http_request.headers.get("accept"))
 
     except Exception as e:
-        return {
+        return render({
             "success": False,
             "error": str(e)
-        }
+        }, http_request.headers.get("accept"))
 
 @app.post("/api/batch-predict")
-async def batch_predict(request: BatchPredictionRequest):
+async def batch_predict(request: BatchPredictionRequest, http_request: Request):
+    check_started()
+    deadline = request_deadline(http_request, REQUEST_DEADLINE)
+    async with batch_admission.admit(http_request, deadline):
+        return await _batch_predict(request, http_request, deadline)
+
+async def _batch_predict(request, http_request, deadline):
     try:
         if not request.texts:
             raise HTTPException(status_code=400, detail="Text list cannot be empty")
 
         results = []
         if detector:
-            for text in request.texts:
-                result = detector.predict(text)
-                results.append(result)
+            results = await run_batch(request.texts, http_request, deadline)
         else:
             # Simple fallback for all texts
             for _ in request.texts:
@@ -187,16 +408,25 @@ async def batch_predict(request: BatchPredictionRequest):
                     'probabilities': {'real': 0.5, 'fake': 0.5}
                 })
 
-        return {
+        if request.format == 'columnar':
+            return render({
+                "success": True,
+                "results": to_columnar(results)
+            }, http_request.headers.get("accept"))
+
+        return render({
             "success": True,
             "results": results
-        }
+        }, http_request.headers.get("accept"))
 
+    except RequestDropped:
+        # Surfaced as 503 by the admission controller
+        raise
     except Exception as e:
-        return {
+        return render({
             "success": False,
             "error": str(e)
-        }
+        }, http_request.headers.get("accept"))
 
 # Serve static files (React build)
 static_dir = os.path.join(os.path.dirname(__file__), 'static')
@@ -206,7 +436,7 @@ if os.path.exists(static_dir):
     @app.get("/{full_path:path}")
     async def serve_react_app(full_path: str):
         # Don't serve API routes as static files
-        if full_path.startswith("api/") or full_path == "health":
+        if full_path.startswith("api/") or full_path in ("health", "ready"):
             raise HTTPException(status_code=404, detail="Not found")
 
         # Try to serve the requested file
@@ -0,0 +1,117 @@
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from fake_news_detector import FakeNewsDetector
+from prediction_cache import PredictionCache
+
+
+def read_corpus(path):
+    """Yield records from a CSV or JSONL corpus.
+
+    Each record needs a text field. Records that already carry a
+    ``fake_probability`` (a previously scored corpus) are stored as-is;
+    everything else, including labeled training data, is scored by the model.
+    """
+    if path.endswith('.jsonl'):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, newline='', encoding='utf-8') as f:
+            yield from csv.DictReader(f)
+
+
+def parse_label(value):
+    """Map a 0/1 or REAL/FAKE label to the model's 0=Real, 1=Fake convention"""
+    if value in (None, ''):
+        return None
+    if str(value).strip().upper() in ('FAKE', '1'):
+        return 1
+    if str(value).strip().upper() in ('REAL', '0'):
+        return 0
+    return None
+
+
+def prefill(detector, cache, records, text_field, batch_size):
+    scored, reused = 0, 0
+    pending = []
+    prescored = []
+
+    def flush():
+        nonlocal scored
+        if pending:
+            detector.predict_batch(pending)
+            scored += len(pending)
+            pending.clear()
+
+    def flush_prescored():
+        nonlocal reused
+        if prescored:
+            cache.put_many(detector.model_version, prescored)
+            reused += len(prescored)
+            prescored.clear()
+
+    for record in records:
+        text = record.get(text_field)
+        if not text:
+            continue
+        if record.get('fake_probability') not in (None, ''):
+            fake_probability = float(record['fake_probability'])
+            # Blank or unrecognised predictions fall back to the probability
+            prediction = parse_label(record.get('prediction'))
+            if prediction is None:
+                prediction = int(fake_probability >= 0.5)
+            prescored.append((detector.preprocess_text(text), prediction, fake_probability))
+            if len(prescored) >= batch_size:
+                flush_prescored()
+        else:
+            pending.append(text)
+            if len(pending) >= batch_size:
+                flush()
+    flush()
+    flush_prescored()
+    return scored, reused
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prefill the persistent prediction cache from a corpus")
+    parser.add_argument('corpus', help="CSV or JSONL file with a text field")
+    parser.add_argument('--model', default='backend/models/fake_news_model.pkl')
+    parser.add_argument('--cache', default=os.environ.get("PREDICTION_CACHE_PATH", "cache/predictions.db"))
+    parser.add_argument('--text-field', default='text')
+    parser.add_argument('--batch-size', type=int, default=512)
+    parser.add_argument('--max-entries', type=int,
+                        default=int(os.environ.get("PREDICTION_CACHE_MAX_ENTRIES", 1_000_000)))
+    args = parser.parse_args()
+
+    if not os.path.exists(args.corpus):
+        print(f"❌ Corpus not found: {args.corpus}")
+        return False
+    if not os.path.exists(args.model):
+        print(f"❌ Model not found: {args.model}")
+        return False
+
+    cache = PredictionCache(args.cache, max_entries=args.max_entries)
+    detector = FakeNewsDetector(args.model, cache=cache)
+
+    print(f"📥 Prefilling {args.cache} from {args.corpus}...")
+    start = time.perf_counter()
+    scored, reused = prefill(detector, cache, read_corpus(args.corpus),
+                             args.text_field, args.batch_size)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Stored {scored} scored and {reused} pre-scored texts in {elapsed:.1f}s "
+          f"({len(cache)} entries for model {detector.model_version})")
+    cache.close()
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)